@@ -1,8 +1,13 @@
 import streamlit as st
 import polars as pl
+import pyarrow as pa
 import os
-from io import BytesIO  # Needed for reading uploaded file bytes with Polars
-from typing import Mapping, Type, Union  # For type hinting schema
+import tempfile
+from io import BytesIO  # In-memory buffer for serializing before saving
+from pathlib import Path
+from typing import Mapping, Optional, Type, Union  # For type hinting schema
+
+from src.phone import E164_PATTERN  # Shared with the sender's number check
 
 # --- Page Configuration ---
 st.set_page_config(page_title="Team Reminder Sender", layout="wide")
@@ -19,6 +24,10 @@ if "settings" not in st.session_state:
         "twilio_phone_number": "+14155490279 (Loaded from .env)",  # Placeholder
     }
 
+# --- Schedule Options ---
+SCHEDULE_OPTIONS = ("End of Month", "Specific Day of Month", "Manual Trigger Only")
+SCHEDULE_INDEX = {option: i for i, option in enumerate(SCHEDULE_OPTIONS)}
+
 if "schedule" not in st.session_state:
     st.session_state.schedule = {
         "type": "End of Month",
@@ -35,133 +44,193 @@ recipients_schema: RecipientsSchemaType = {
     "PhoneNumber": pl.Utf8,
     "SendFlag": pl.Boolean,
 }
+# Arrow equivalent, used when converting edited pandas data back to Polars
+recipients_arrow_schema = pa.schema(
+    [
+        ("Name", pa.string()),
+        ("PhoneNumber", pa.string()),
+        ("SendFlag", pa.bool_()),
+    ]
+)
 
-if "recipients_df" not in st.session_state:
-    # Try to load existing CSV, otherwise use empty DataFrame
-    default_csv = "August Rent - Sheet1.csv"
+# --- Recipients Storage ---
+# Parquet is the app's own copy: columnar, typed, and read without CSV parsing.
+# The CSV sheet is only imported when no Parquet file exists yet, and is never
+# written: exports go to their own file (Name, PhoneNumber, SendFlag columns).
+RECIPIENTS_PATH = "recipients.parquet"
+RECIPIENTS_CSV_PATH = "August Rent - Sheet1.csv"
+RECIPIENTS_EXPORT_PATH = "recipients_export.csv"
+
+# --- Recipients Column Aliases (casefolded) ---
+# Map potential Name/Phone column names to the target column
+ROLE_BY_NAME = {
+    "name": "Name",
+    "tenant": "Name",
+    "contact": "Name",
+    "phonenumber": "PhoneNumber",
+    "phone": "PhoneNumber",
+    "mobile": "PhoneNumber",
+}
+# Map potential flag column names to interpretation (True means send)
+FLAG_BY_NAME = {
+    "sendflag": True,
+    "send?": True,
+    "active": True,  # Flags where True means send
+    "paid": False,
+    "false": False,  # Flags where False means send (e.g., 'FALSE' means not paid)
+}
+# Case-insensitive, anchored flag values; matched in one pass without lowercasing
+TRUTHY_PATTERN = r"(?i)^(true|1|yes|y)$"
+FALSY_PATTERN = r"(?i)^(false|0|no|n)$"
+
+
+# --- File Helpers ---
+def write_bytes_atomic(path: str, data: bytes) -> None:
+    """Write data to a temp file beside `path`, then atomically replace `path`.
+
+    An interrupted save leaves the previous file intact instead of a partial one.
+    Each call gets its own temp file, so concurrent sessions can't clobber it.
+    """
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path) or ".", prefix=f".{os.path.basename(path)}."
+    )
     try:
-        if os.path.exists(default_csv):
-            # Read CSV using Polars, infer schema length 0 reads all as Utf8 initially
-            # This makes column mapping/checking more robust before casting
-            temp_df = pl.read_csv(default_csv, has_header=True, infer_schema_length=0)
-
-            # --- Flexible Column Mapping (Case-Insensitive) ---
-            name_cols = ["Name", "Tenant", "Contact"]
-            phone_cols = ["PhoneNumber", "Phone", "Mobile"]
-            # Map potential flag column names (lowercase) to interpretation (True means send)
-            send_cols_map = {
-                "sendflag": True,
-                "send?": True,
-                "active": True,  # Flags where True means send
-                "paid": False,
-                "false": False,  # Flags where False means send (e.g., 'FALSE' means not paid)
-            }
-
-            mapped_cols = {}
-            found_name, found_phone = False, False
-            send_col_source = None  # Store the original column name used for the flag
-            send_flag_interpretation = (
-                True  # Default: True in source means SendFlag=True
-            )
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(data)
+            tmp.flush()
+            os.fsync(tmp.fileno())  # Data on disk before the rename makes it visible
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def file_signature(path: str) -> Optional[tuple[int, int]]:
+    """Return `path`'s (mtime_ns, size), or None if it doesn't exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+# --- Recipients CSV Loading ---
+def build_recipients_lazy(raw: bytes, source_label: str) -> pl.LazyFrame:
+    """Build the query plan mapping raw recipients CSV bytes to `recipients_schema`.
+
+    Columns are matched case-insensitively (e.g. 'Tenant' -> Name) and the
+    send flag column is normalized to a boolean SendFlag. Nothing is parsed
+    until the returned LazyFrame is collected.
+    Raises ValueError if the Name or PhoneNumber column can't be found.
+    """
+    # infer_schema_length=0 reads all as Utf8 so column mapping is robust before cast
+    lf = pl.scan_csv(raw, has_header=True, infer_schema_length=0)
+
+    # Column names come from the header alone (no rows are read here)
+    columns = lf.collect_schema().names()
+
+    role_sources: dict[str, str] = {}  # Target column -> original CSV column
+    send_col_source = None  # Store the original column name used for the flag
+    send_flag_interpretation = True  # Default: True in source means SendFlag=True
+
+    # --- Flexible Column Mapping (Case-Insensitive) ---
+    # Single pass of dict lookups: first match wins for Name, Phone and the flag
+    for col in columns:
+        col_key = col.casefold()
+        role = ROLE_BY_NAME.get(col_key)
+        if role is not None:
+            role_sources.setdefault(role, col)
+        elif send_col_source is None and col_key in FLAG_BY_NAME:
+            send_col_source = col
+            send_flag_interpretation = FLAG_BY_NAME[col_key]
+
+    mapped_cols = {source: role for role, source in role_sources.items()}
+    found_name = "Name" in role_sources
+    found_phone = "PhoneNumber" in role_sources
+
+    if not (found_name and found_phone):
+        missing: list[str] = []
+        if not found_name:
+            missing.append("'Name' (or similar)")
+        if not found_phone:
+            missing.append("'PhoneNumber' (or similar)")
+        raise ValueError(f"Could not find required column(s): {', '.join(missing)}")
+
+    # Convert the source flag column to boolean SendFlag based on interpretation
+    if send_col_source:
+        if send_flag_interpretation:  # True/Truthy in source means True (send)
+            send_pattern = TRUTHY_PATTERN
+        else:  # False/Falsy in source means True (send)
+            send_pattern = FALSY_PATTERN
+        # The regex match is itself the flag; empty cells (null) and anything else
+        # mean don't send. Polars' native Boolean CSV parsing isn't used because it
+        # only understands true/false, so values like 'yes' or '1' would be lost.
+        send_flag = (
+            pl.col(send_col_source)
+            .str.contains(send_pattern)
+            .fill_null(False)
+            .alias("SendFlag")
+        )
+    else:
+        # If no send flag column found, default to True
+        st.warning(
+            f"No recognizable send flag column found in {source_label}. Defaulting SendFlag to True for all rows."
+        )
+        send_flag = pl.lit(True).alias("SendFlag")
+
+    # One query plan, so Polars only reads the mapped columns and computes
+    # the flag in the same pass as the rename/select.
+    # No cast needed: Name/PhoneNumber are read as Utf8 and SendFlag is Boolean.
+    return (
+        lf.rename(mapped_cols)  # type: ignore
+        .with_columns(send_flag)
+        .select(["Name", "PhoneNumber", "SendFlag"])
+    )
 
-            # Find best match for Name and Phone (case-insensitive)
-            for col in temp_df.columns:
-                col_lower = col.lower()
-                if not found_name and any(c.lower() == col_lower for c in name_cols):
-                    mapped_cols[col] = "Name"
-                    found_name = True
-                elif not found_phone and any(
-                    c.lower() == col_lower for c in phone_cols
-                ):
-                    mapped_cols[col] = "PhoneNumber"
-                    found_phone = True
-
-            # Find best match for Send Flag (case-insensitive)
-            for col in (
-                temp_df.columns
-            ):  # Corrected loop variable from temp_cols to temp_df.columns
-                col_lower = col.lower()
-                if col not in mapped_cols:  # Don't reuse Name/Phone col
-                    if col_lower in send_cols_map:
-                        send_col_source = col
-                        send_flag_interpretation = send_cols_map[col_lower]
-                        break  # Found the first matching flag
-
-            if found_name and found_phone:
-                # Rename based on found columns. Linter might still warn here due to dynamic nature.
-                selected_df = temp_df.rename(mapped_cols)  # type: ignore
-
-                # Convert SendFlagSource to boolean SendFlag based on interpretation
-                if send_col_source:
-                    # Standardize based on interpretation (True means send)
-                    if (
-                        send_flag_interpretation
-                    ):  # True/Truthy in source means True (send)
-                        selected_df = selected_df.with_columns(
-                            pl.when(
-                                pl.col(send_col_source)
-                                .str.to_lowercase()
-                                .is_in(["true", "1", "yes", "y"])
-                            )
-                            .then(pl.lit(True))
-                            .otherwise(
-                                pl.lit(False)
-                            )  # Assume anything else means don't send
-                            .alias("SendFlag")
-                        )
-                    else:  # False/Falsy in source means True (send)
-                        selected_df = selected_df.with_columns(
-                            pl.when(
-                                pl.col(send_col_source)
-                                .str.to_lowercase()
-                                .is_in(["false", "0", "no", "n"])
-                            )
-                            .then(pl.lit(True))
-                            .otherwise(
-                                pl.lit(False)
-                            )  # Assume anything else means don't send
-                            .alias("SendFlag")
-                        )
-                    # Drop the original source column if it's different from 'SendFlag' and exists
-                    if (
-                        send_col_source != "SendFlag"
-                        and send_col_source in selected_df.columns
-                    ):
-                        selected_df = selected_df.drop(send_col_source)
-                    selected_columns = ["Name", "PhoneNumber", "SendFlag"]
-                else:
-                    # If no send flag column found, default to True
-                    st.warning(
-                        f"No recognizable send flag column found in {default_csv}. Defaulting SendFlag to True for all rows."
-                    )
-                    selected_df = selected_df.with_columns(
-                        pl.lit(True).alias("SendFlag")
-                    )
-                    selected_columns = ["Name", "PhoneNumber", "SendFlag"]
 
-                # Select final columns and cast to the correct schema
-                # Use strict=False to allow casting even if some columns were missing initially
-                # (though Name/Phone are checked above, SendFlag might default)
-                st.session_state.recipients_df = selected_df.select(
-                    selected_columns
-                ).cast(recipients_schema, strict=False)  # type: ignore
+@st.cache_data(ttl=None, show_spinner=False)
+def load_recipients_from_bytes(raw: bytes, source_label: str) -> pl.DataFrame:
+    """Collect the recipients plan for raw CSV bytes into a concrete DataFrame.
 
-            else:
-                missing: list[str] = []
-                if not found_name:
-                    missing.append("'Name' (or similar)")
-                if not found_phone:
-                    missing.append("'PhoneNumber' (or similar)")
-                st.warning(
-                    f"Could not find required column(s): {', '.join(missing)} in {default_csv}. Starting empty."
-                )
-                st.session_state.recipients_df = pl.DataFrame(schema=recipients_schema)
+    Cached on the file contents, so Streamlit reruns with an unchanged file
+    skip the parse entirely.
+    """
+    return build_recipients_lazy(raw, source_label).collect()
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)  # Only the current file
+def load_recipients_from_file(path: str, mtime_ns: int, size: int) -> pl.DataFrame:
+    """Load the recipients Parquet or CSV file at `path`, shared across sessions.
+
+    `mtime_ns` and `size` are only part of the cache key: new sessions reuse the
+    loaded DataFrame until the file on disk changes.
+    """
+    if path.endswith(".parquet"):
+        # Written by this app, so it's already in recipients_schema
+        return pl.read_parquet(path)
+    return load_recipients_from_bytes(Path(path).read_bytes(), path)
+
+
+if "recipients_df" not in st.session_state:
+    # Load the saved Parquet list, else import the CSV, otherwise use empty DataFrame
+    source_path = (
+        RECIPIENTS_PATH if os.path.exists(RECIPIENTS_PATH) else RECIPIENTS_CSV_PATH
+    )
+    try:
+        if os.path.exists(source_path):
+            source_stat = os.stat(source_path)
+            st.session_state.recipients_df = load_recipients_from_file(
+                source_path, source_stat.st_mtime_ns, source_stat.st_size
+            )
         else:
-            st.info(f"{default_csv} not found. Starting with empty recipient list.")
+            st.info(f"{source_path} not found. Starting with empty recipient list.")
             st.session_state.recipients_df = pl.DataFrame(schema=recipients_schema)
+    except ValueError as e:
+        st.warning(f"{e} in {source_path}. Starting empty.")
+        st.session_state.recipients_df = pl.DataFrame(schema=recipients_schema)
     except Exception as e:
         st.error(
-            f"Error reading or processing {default_csv}: {e}. Please check the file format. Starting with empty table."
+            f"Error reading or processing {source_path}: {e}. Please check the file format. Starting with empty table."
         )
         st.session_state.recipients_df = pl.DataFrame(schema=recipients_schema)
 
@@ -207,22 +276,18 @@ with tab_settings:
 with tab_schedule:
     st.header("When to Send Reminders")
 
-    # Determine index safely
-    schedule_options = ["End of Month", "Specific Day of Month", "Manual Trigger Only"]
     # Ensure the value retrieved is treated as a string for index lookup
     current_schedule_type = str(
         st.session_state.schedule.get("type", "Manual Trigger Only")
     )
-    try:
-        schedule_index = schedule_options.index(current_schedule_type)
-    except ValueError:
-        schedule_index = schedule_options.index(
-            "Manual Trigger Only"
-        )  # Default if invalid value in state
+    # Default to "Manual Trigger Only" if invalid value in state
+    schedule_index = SCHEDULE_INDEX.get(
+        current_schedule_type, SCHEDULE_INDEX["Manual Trigger Only"]
+    )
 
     schedule_type = st.selectbox(
         "Schedule Type",
-        options=schedule_options,
+        options=SCHEDULE_OPTIONS,
         index=schedule_index,
         key="schedule_type_select",
     )
@@ -294,111 +359,20 @@ with tab_recipients:
             "Choose a CSV file", type="csv", key="csv_uploader"
         )
         if uploaded_file is not None:
-            try:
-                # Read uploaded CSV into Polars DataFrame from buffer
-                # Wrap in BytesIO for compatibility
-                file_buffer = BytesIO(uploaded_file.getvalue())
-                # Read all as string initially
-                new_df = pl.read_csv(
-                    file_buffer, has_header=True, infer_schema_length=0
-                )
-
-                # --- Reuse Column Mapping Logic (Case-Insensitive) ---
-                name_cols = ["Name", "Tenant", "Contact"]
-                phone_cols = ["PhoneNumber", "Phone", "Mobile"]
-                send_cols_map = {
-                    "sendflag": True,
-                    "send?": True,
-                    "active": True,
-                    "paid": False,
-                    "false": False,
-                }
-
-                mapped_cols = {}
-                found_name, found_phone = False, False
-                send_col_source = None
-                send_flag_interpretation = True
-
-                for col in new_df.columns:
-                    col_lower = col.lower()
-                    if not found_name and any(
-                        c.lower() == col_lower for c in name_cols
-                    ):
-                        mapped_cols[col] = "Name"
-                        found_name = True
-                    elif not found_phone and any(
-                        c.lower() == col_lower for c in phone_cols
-                    ):
-                        mapped_cols[col] = "PhoneNumber"
-                        found_phone = True
-
-                for col in new_df.columns:
-                    col_lower = col.lower()
-                    if col not in mapped_cols:
-                        if col_lower in send_cols_map:
-                            send_col_source = col
-                            send_flag_interpretation = send_cols_map[col_lower]
-                            break
-                # --- End Reuse ---
-
-                if found_name and found_phone:
-                    selected_df = new_df.rename(mapped_cols)  # type: ignore
-
-                    if send_col_source:
-                        if send_flag_interpretation:  # True in source means send
-                            selected_df = selected_df.with_columns(
-                                pl.when(
-                                    pl.col(send_col_source)
-                                    .str.to_lowercase()
-                                    .is_in(["true", "1", "yes", "y"])
-                                )
-                                .then(pl.lit(True))
-                                .otherwise(pl.lit(False))
-                                .alias("SendFlag")
-                            )
-                        else:  # False in source means send
-                            selected_df = selected_df.with_columns(
-                                pl.when(
-                                    pl.col(send_col_source)
-                                    .str.to_lowercase()
-                                    .is_in(["false", "0", "no", "n"])
-                                )
-                                .then(pl.lit(True))
-                                .otherwise(pl.lit(False))
-                                .alias("SendFlag")
-                            )
-                        if (
-                            send_col_source != "SendFlag"
-                            and send_col_source in selected_df.columns
-                        ):
-                            selected_df = selected_df.drop(send_col_source)
-                        selected_columns = ["Name", "PhoneNumber", "SendFlag"]
-                    else:
-                        st.warning(
-                            "No recognizable send flag column found in uploaded CSV. Defaulting SendFlag to True."
-                        )
-                        selected_df = selected_df.with_columns(
-                            pl.lit(True).alias("SendFlag")
-                        )
-                        selected_columns = ["Name", "PhoneNumber", "SendFlag"]
-
-                    # Select and cast to the target schema
-                    st.session_state.recipients_df = selected_df.select(
-                        selected_columns
-                    ).cast(recipients_schema, strict=False)  # type: ignore
-                    st.success("CSV uploaded and processed successfully!")
-                else:
-                    missing = []
-                    if not found_name:
-                        missing.append("'Name' (or similar)")
-                    if not found_phone:
-                        missing.append("'PhoneNumber' (or similar)")
-                    st.error(
-                        f"Uploaded CSV must contain columns for: {', '.join(missing)}."
+            # Only process an upload once; reruns with the same file keep the
+            # current (possibly edited) list instead of re-running the pipeline.
+            # file_id is new for every upload, so re-uploading a file applies it again
+            if st.session_state.get("_last_upload_id") != uploaded_file.file_id:
+                try:
+                    st.session_state.recipients_df = load_recipients_from_bytes(
+                        uploaded_file.getvalue(), "uploaded CSV"
                     )
-
-            except Exception as e:
-                st.error(f"Error processing uploaded file: {e}")
+                    st.session_state["_last_upload_id"] = uploaded_file.file_id
+                    st.success("CSV uploaded and processed successfully!")
+                except ValueError as e:
+                    st.error(f"Uploaded CSV is missing required columns. {e}.")
+                except Exception as e:
+                    st.error(f"Error processing uploaded file: {e}")
 
     st.markdown("**Current Recipient List**")
     st.caption(
@@ -421,10 +395,9 @@ with tab_recipients:
             ),
             "PhoneNumber": st.column_config.TextColumn(
                 "Phone Number",
-                help="Enter the phone number ideally in E.164 format (e.g., +14155552671)",
-                # Basic E.164 format regex validation - allows flexibility but guides user
-                # Making it optional for cases where validation is too strict initially
-                # validate="^\+[1-9]\d{1,14}$",
+                help="Enter the phone number in E.164 format, with '+' and country code (e.g., +14155552671)",
+                # Not validated inline: rows the sender would skip are listed below,
+                # checked with the same E164_PATTERN the sender uses
             ),
         },
         use_container_width=True,
@@ -438,11 +411,13 @@ with tab_recipients:
             try:
                 # Check if it looks like a pandas DataFrame before converting
                 if hasattr(edited_df, "to_dict"):
-                    st.session_state.recipients_df = pl.from_pandas(edited_df)
-                    # Recast after conversion to ensure types, handle potential errors
-                    st.session_state.recipients_df = (
-                        st.session_state.recipients_df.cast(  # type: ignore
-                            recipients_schema, strict=False
+                    # Convert via Arrow with an explicit schema: no type inference
+                    # pass, and the result already matches recipients_schema
+                    st.session_state.recipients_df = pl.from_arrow(
+                        pa.Table.from_pandas(
+                            edited_df,
+                            schema=recipients_arrow_schema,
+                            preserve_index=False,
                         )
                     )
                 else:
@@ -458,29 +433,82 @@ with tab_recipients:
             except Exception as e:
                 st.error(f"Error updating table after edits: {e}")
         else:
-            # It's already a Polars DataFrame
-            st.session_state.recipients_df = edited_df
-            # Still good practice to ensure schema after editing
-            st.session_state.recipients_df = st.session_state.recipients_df.cast(  # type: ignore
-                recipients_schema,  # type: ignore
-                strict=False,
+            # It's already a Polars DataFrame; only the checkbox column can come
+            # back loosely typed after editing
+            st.session_state.recipients_df = edited_df.cast(
+                {"SendFlag": pl.Boolean}, strict=False
+            )
+
+    # Check every number marked for sending in one vectorized regex pass, using the
+    # sender's own pattern so the rows flagged here are exactly the ones it skips
+    validated_df = st.session_state.get("recipients_df")
+    if isinstance(validated_df, pl.DataFrame) and not validated_df.is_empty():
+        invalid_df = validated_df.filter(
+            pl.col("SendFlag").fill_null(False)
+            & ~pl.col("PhoneNumber").str.contains(E164_PATTERN).fill_null(False)
+        )
+        if not invalid_df.is_empty():
+            st.warning(
+                f"{invalid_df.height} recipient(s) marked to send have invalid phone numbers and will be skipped (expected E.164 with '+' and country code, e.g. +14155552671)."
             )
+            st.dataframe(invalid_df, use_container_width=True)
 
-    if st.button("Save Recipients to CSV", key="save_csv_button"):
+    if st.button("Save Recipients", key="save_button"):
         # Ensure we have a Polars DataFrame before saving
         current_df = st.session_state.get("recipients_df")
-        save_path = "August Rent - Sheet1.csv"  # Define path before try block
+        save_path = RECIPIENTS_PATH  # Define path before try block
         if isinstance(current_df, pl.DataFrame) and not current_df.is_empty():
-            try:
-                current_df.write_csv(save_path)
-                st.success(f"Recipient data saved to `{save_path}`.")
-            except Exception as e:
-                st.error(f"Failed to save CSV to `{save_path}`: {e}")
+            # Row-order-sensitive content hash; skip rewriting an unchanged file.
+            # The file is shared by every session (and editable outside the app),
+            # so only skip while it is still exactly the file this session wrote.
+            current_hash = current_df.with_row_index().hash_rows(seed=0).sum()
+            if st.session_state.get("_saved_state") == (
+                current_hash,
+                file_signature(save_path),
+            ):
+                st.info(f"No changes since the last save to `{save_path}`.")
+            else:
+                try:
+                    # Serialize in memory, then swap the file in with one write
+                    buffer = BytesIO()
+                    current_df.write_parquet(buffer, compression="zstd")
+                    write_bytes_atomic(save_path, buffer.getvalue())
+                    st.session_state["_saved_state"] = (
+                        current_hash,
+                        file_signature(save_path),
+                    )
+                    st.success(f"Recipient data saved to `{save_path}`.")
+                except Exception as e:
+                    st.error(f"Failed to save recipients to `{save_path}`: {e}")
         elif isinstance(current_df, pl.DataFrame) and current_df.is_empty():
             st.warning("Recipient list is empty. Nothing to save.")
         else:
             st.warning("No valid recipient data found in session state to save.")
 
+    if st.button("Export Recipients to CSV", key="export_csv_button"):
+        current_df = st.session_state.get("recipients_df")
+        export_path = RECIPIENTS_EXPORT_PATH
+        if isinstance(current_df, pl.DataFrame) and not current_df.is_empty():
+            try:
+                buffer = BytesIO()
+                current_df.write_csv(buffer)
+                write_bytes_atomic(export_path, buffer.getvalue())
+                st.success(f"Recipient data exported to `{export_path}`.")
+            except Exception as e:
+                st.error(f"Failed to export CSV to `{export_path}`: {e}")
+        else:
+            st.warning("Recipient list is empty. Nothing to export.")
+
+    if st.button("Reload Recipients", key="reload_button"):
+        # Drop cached loads and unsaved edits so the file is read fresh on rerun
+        load_recipients_from_file.clear()
+        load_recipients_from_bytes.clear()
+        st.session_state.pop("recipients_df", None)
+        st.session_state.pop("_saved_state", None)
+        # Let a file still in the uploader apply again, so the table matches it
+        st.session_state.pop("_last_upload_id", None)
+        st.rerun()
+
     st.info(
         "💡 Connecting this list to the actual message sending logic is the next step.",
         icon="ℹ️",
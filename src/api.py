@@ -1,7 +1,7 @@
 # src/api.py
 import logging
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from arq.connections import ArqRedis  # Import the ArqRedis type
 from arq.jobs import Job  # Import Job type
@@ -63,10 +63,11 @@ async def read_root():
 
 
 # Example placeholder using DB session
+# Sync handler: blocking DB work runs in the threadpool instead of the event loop
 @app.get("/items/{item_id}")  # Example route
-async def read_item(item_id: int, db: Session = Depends(get_db)):
+def read_item(item_id: int, db: Session = Depends(get_db)):
     logger.info(
-        f"Reading item {item_id} (placeholder). DB Session active: {db.is_active}"
+        "Reading item %s (placeholder). DB Session active: %s", item_id, db.is_active
     )
     # Replace with actual DB query using crud functions
     # from src import crud # Import crud here when needed
@@ -80,19 +81,25 @@ async def read_item(item_id: int, db: Session = Depends(get_db)):
     }
 
 
-# Placeholder for triggering a task using arq pool from app state
-@app.post("/send/trigger")
-async def trigger_send(arq_pool: ArqRedis = Depends(lambda: app.state.arq_pool)):
-    if not arq_pool:
+# --- Dependencies ---
+def get_arq_pool_dep(request: Request) -> ArqRedis:
+    """Return the arq pool created in lifespan, or 503 if it isn't available."""
+    arq_pool = getattr(request.app.state, "arq_pool", None)
+    if arq_pool is None:
         logger.error("Arq pool not available.")
-        raise HTTPException(status_code=500, detail="Task queue not available")
+        raise HTTPException(status_code=503, detail="Task queue not available")
+    return arq_pool
+
 
+# Placeholder for triggering a task using arq pool from app state
+@app.post("/send/trigger")
+async def trigger_send(arq_pool: ArqRedis = Depends(get_arq_pool_dep)):
     logger.info("Manual send triggered. Enqueuing task...")
     # Enqueue the main task
     job: Job | None = await arq_pool.enqueue_job("send_all_reminders_task")
 
     if job:
-        logger.info(f"Enqueued job: {job.job_id}")
+        logger.info("Enqueued job: %s", job.job_id)
         return {"message": "Send process triggered", "job_id": job.job_id}
     else:
         logger.error("Failed to enqueue job.")
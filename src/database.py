@@ -4,7 +4,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 
-from src.settings import settings  # Absolute import
+from src.settings import get_settings  # Absolute import
 from src.logging_config import setup_logging  # Absolute import
 
 # --- Setup Logging ---
@@ -15,8 +15,9 @@ logger = logging.getLogger(__name__)
 # Create the SQLAlchemy engine
 # For SQLite, connect_args is needed to support multi-threaded access (like FastAPI might use)
 engine = create_engine(
-    settings.DATABASE_URL,
+    get_settings().DATABASE_URL,
     connect_args={"check_same_thread": False},  # Only needed for SQLite
+    pool_size=get_settings().DB_POOL_SIZE,  # Worker max_jobs is sized against this
 )
 
 # Create a configured "Session" class
@@ -27,7 +28,8 @@ Base = declarative_base()
 
 
 # Dependency for FastAPI to get a DB session
-async def get_db():
+# Plain (sync) generator: SQLAlchemy calls block, so FastAPI runs it in its threadpool
+def get_db():
     db = SessionLocal()
     try:
         yield db
@@ -43,7 +45,7 @@ def create_db_tables():
         Base.metadata.create_all(bind=engine)
         logger.info("Database tables created successfully.")
     except Exception as e:
-        logger.error(f"Error creating database tables: {e}")
+        logger.error("Error creating database tables: %s", e)
 
 
 # Example usage (e.g., in a startup script or main)
@@ -2,6 +2,29 @@
 # src/logging_config.py
 import logging
 import logging.config
+import time
+
+
+class CachedFormatter(logging.Formatter):
+    """Formatter that reuses the formatted timestamp for records in the same second."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (second, formatted) kept in one tuple so handler threads never see a mismatch
+        self._cached_time: tuple[int, str] = (-1, "")
+
+    def formatTime(self, record, datefmt=None):
+        datefmt = datefmt or self.datefmt
+        if not datefmt:
+            # Default format includes milliseconds, which can't be cached per second
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, formatted = self._cached_time
+        if second != cached_second:
+            formatted = time.strftime(datefmt, self.converter(second))
+            self._cached_time = (second, formatted)
+        return formatted
+
 
 # Basic logging config dictionary
 LOGGING_CONFIG = {
@@ -9,7 +32,8 @@ LOGGING_CONFIG = {
     "disable_existing_loggers": False,
     "formatters": {
         "default": {
-            "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+            "()": "src.logging_config.CachedFormatter",
+            "fmt": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
             "datefmt": "%Y-%m-%d %H:%M:%S",  # Optional: Add date format
         },
     },
@@ -45,7 +69,15 @@ LOGGING_CONFIG = {
 }
 
 
+# Set once dictConfig has run; api, database and worker all call setup_logging()
+_configured = False
+
+
 def setup_logging():
-    """Apply the logging configuration."""
+    """Apply the logging configuration (only the first call has any effect)."""
+    global _configured
+    if _configured:
+        return
     logging.config.dictConfig(LOGGING_CONFIG)
+    _configured = True
     logging.getLogger(__name__).info("Logging configured.")
@@ -1,54 +1,196 @@
+import asyncio
 import calendar
+import csv
 import datetime
+import logging
+import sys
+import time
 from typing import Optional
 
+from aiohttp import ClientSession, TCPConnector
+from arq import create_pool
+from twilio.base.exceptions import TwilioRestException  # type: ignore
+from twilio.http.async_http_client import AsyncTwilioHttpClient  # type: ignore
+from twilio.http.response import Response  # type: ignore
 from twilio.rest import Client  # type: ignore - stubs totally do exist
 
-from .settings import settings  # Import the settings object
+from .logging_config import setup_logging
+from .phone import E164_RE
+from .rate_limit import AIMDLimiter, TokenBucket
+from .settings import get_settings  # Cached settings accessor
+
+logger = logging.getLogger(__name__)
+
+# Reminder text; %-formatted per send (no format-spec parsing like str.format)
+_BODY = "Hello %s, your reminder message here. [This part needs completion]"
 
 
 def days_until_end_month():
     d = datetime.date.today()
-    end_of_month = datetime.date(
-        d.year, d.month, calendar.monthrange(d.year, d.month)[-1]
+    return calendar.monthrange(d.year, d.month)[1] - d.day
+
+
+class _PacedHttpClient(AsyncTwilioHttpClient):
+    """Async Twilio HTTP client with a sized connection pool and paced 429 retries.
+
+    Only 429s are retried: Twilio rejected those without sending, whereas retrying
+    a 5xx could send an SMS twice. A 429's Retry-After also pauses the shared
+    TokenBucket, so every other send waits it out instead of hitting the same 429,
+    and each retry then takes a token so retries stay within the rate too.
+    """
+
+    def __init__(
+        self,
+        max_connections: int,
+        limiter: Optional[TokenBucket] = None,
+        retries: int = 5,
+        backoff: float = 0.5,
+    ):
+        super().__init__(pool_connections=False)
+        # Keep-alive pool sized to the send concurrency so sends don't churn connections
+        self.session = ClientSession(connector=TCPConnector(limit=max_connections))
+        self._limiter = limiter
+        self._retries = retries
+        self._backoff = backoff
+
+    async def request(self, *args, **kwargs) -> Response:
+        attempt = 0
+        while True:
+            response = await super().request(*args, **kwargs)
+            if response.status_code != 429 or attempt >= self._retries:
+                # Twilio raises TwilioRestException for a final 429 as usual
+                return response
+            delay = _retry_after(response) or self._backoff * 2**attempt
+            if self._limiter:
+                self._limiter.pause(delay)
+                # Wait out the pause in the bucket's queue rather than all retrying
+                # at once when it ends, on top of senders already holding tokens
+                await self._limiter.acquire_async()
+            else:
+                await asyncio.sleep(delay)
+            attempt += 1
+
+
+def _retry_after(response: Response) -> Optional[float]:
+    try:
+        return float(response.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+def create_twilio_client(limiter: Optional[TokenBucket] = None) -> Client:
+    """Create an asyncio Twilio client; reuse it so its session keeps connections alive.
+
+    Must be called with an event loop running (e.g. in the arq worker's startup).
+    """
+    # Use settings for credentials
+    settings = get_settings()
+    http_client = _PacedHttpClient(settings.MAX_CONCURRENCY, limiter=limiter)
+    return Client(
+        settings.TWILIO_ACCOUNT_SID,
+        settings.TWILIO_AUTH_TOKEN,
+        http_client=http_client,
     )
-    end = str(end_of_month).split("-")
-    current = str(d).split("-")
-    return int(end[2]) - int(current[2])
 
 
-def send_message(
+async def send_message(
+    client: Client,
     phone_number: Optional[str] = None,
     name: Optional[str] = None,
+    limiter: Optional[TokenBucket] = None,
+    concurrency: Optional[AIMDLimiter] = None,
 ) -> None:
     if not phone_number:
-        print(f"Skipping message for {name}: Phone number is missing.")
+        logger.warning("Skipping message for %s: Phone number is missing.", name)
+        return
+    # Reject malformed numbers here instead of spending a token and a 400 round-trip
+    if not E164_RE.match(phone_number):
+        logger.warning(
+            "Skipping message for %s: %r is not an E.164 number (+ country code).",
+            name,
+            phone_number,
+        )
         return
 
-    # Use settings for credentials and phone number
-    client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
+    settings = get_settings()
+    if settings.TWILIO_MESSAGING_SERVICE_SID:
+        # Twilio spreads these over the service's sender pool and queues them itself
+        sender = {"messaging_service_sid": settings.TWILIO_MESSAGING_SERVICE_SID}
+    else:
+        # Use settings for from_ number
+        sender = {"from_": settings.TWILIO_PHONE_NUMBER}
 
+    if concurrency:
+        await concurrency.acquire()
+    # Everything after taking the slot is inside the try, so the slot is released
+    # even if the task is cancelled (job timeout, shutdown) while it waits below.
+    # throttled stays None unless Twilio answered; then the limit isn't adjusted.
+    throttled: Optional[bool] = None
+    started = time.monotonic()
     try:
-        message = client.messages.create(
-            body="Hello {name}, your reminder message here. [This part needs completion]".format(
-                name=name if name else "Tenant"
-            ),
-            from_=settings.TWILIO_PHONE_NUMBER,  # Use settings for from_ number
+        # Pace requests to the number's MPS limit rather than retrying 429s
+        if limiter:
+            await limiter.acquire_async()
+        started = time.monotonic()  # Time the request, not the wait for a token
+        message = await client.messages.create_async(
+            body=_BODY % (name or "Tenant",),
             to=phone_number,
+            **sender,
         )
-        print(f"Sent to: {name} | [{message.sid}]")
-    except Exception as e:
-        print(f"Failed to send message to {name} ({phone_number}): {e}")
+        throttled = False
+        logger.debug("Sent to: %s | [%s]", name, message.sid)
+    except TwilioRestException as e:
+        # Rate limiting or server trouble: tell the concurrency limiter to back off
+        throttled = e.status == 429 or e.status >= 500
+        logger.error("Failed to send message to %s (%s): %s", name, phone_number, e)
+    except Exception:
+        logger.exception("Failed to send message to %s (%s)", name, phone_number)
+    finally:
+        if concurrency:
+            await concurrency.release(throttled, time.monotonic() - started)
+
+
+def read_tenants(spreadsheet: str) -> list[tuple[str, str]]:
+    """Return (name, phone_number) for each tenant row that should get a reminder."""
+    with open(spreadsheet, "r", newline="") as tenants:
+        # csv.reader handles quoted fields (e.g. "Smith, Jane") that str.split breaks on
+        reader = csv.reader(tenants)
+        next(reader, None)  # Skip the header row
+        return [
+            (row[0], row[3].strip())
+            for row in reader
+            if len(row) > 3 and row[2] == "FALSE"
+        ]
+
 
+async def enqueue_reminders(spreadsheet: str) -> int:
+    """Enqueue one send_single_reminder_task per tenant; the arq worker sends them."""
+    # Imported here: the worker imports this module for the Twilio helpers
+    from .worker import WorkerSettings, enqueue_jobs_bulk, reminder_job_id
 
-def main(spreadsheet: str = "August Rent - Sheet1.csv") -> None:
-    with open(spreadsheet, "r") as tenants:
-        for _, tenant in enumerate(tenants):
-            tenant_info = tenant.split(",")
-            if len(tenant_info) > 3 and tenant_info[2] == "FALSE":
-                phone_number = tenant_info[3].strip()
-                # Pass only necessary parameters
-                send_message(name=tenant_info[0], phone_number=phone_number)
+    tenants = read_tenants(spreadsheet)
+    redis = await create_pool(WorkerSettings.redis_settings)
+    try:
+        # Deterministic IDs: running the CLI twice in a day doesn't double-send
+        return await enqueue_jobs_bulk(
+            redis,
+            "send_single_reminder_task",
+            tenants,
+            [reminder_job_id(phone) for _, phone in tenants],
+        )
+    finally:
+        await redis.close()
+
+
+def main(spreadsheet: Optional[str] = None) -> None:
+    setup_logging()
+    # Sending happens in long-lived worker processes (python -m arq
+    # src.worker.WorkerSettings), which reuse one Twilio client and limiter
+    enqueued = asyncio.run(
+        enqueue_reminders(spreadsheet or get_settings().RECIPIENTS_CSV)
+    )
+    logger.info("Enqueued %d reminders.", enqueued)
 
 
-main()
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
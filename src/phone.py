@@ -0,0 +1,8 @@
+# src/phone.py
+import re
+
+# E.164 phone numbers: '+', country code and subscriber number, 8 to 15 digits.
+# The '+' is required: without it a national number (e.g. US 4155550003) can't be
+# told apart from one with a country code, so it is never guessed at.
+E164_PATTERN = r"^\+[1-9]\d{7,14}$"
+E164_RE = re.compile(E164_PATTERN)
@@ -0,0 +1,125 @@
+# src/rate_limit.py
+import asyncio
+import threading
+import time
+from collections import deque
+
+
+class TokenBucket:
+    """Token-bucket rate limiter, usable from threads or asyncio tasks.
+
+    Admits `rate` acquisitions per `period` seconds on average, with bursts of up
+    to `capacity`. Each acquire reserves a token immediately and then sleeps only
+    until that token is due, so there is no polling and no waiting below the limit.
+    """
+
+    def __init__(self, rate: float, period: float = 1.0, capacity: float | None = None):
+        self._interval = period / rate  # Seconds per token
+        self._capacity = capacity if capacity is not None else rate
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        # A threading lock works for asyncio too: the critical section never blocks
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take one token (possibly borrowing ahead) and return the seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            refill = (now - self._updated) / self._interval
+            self._tokens = min(self._capacity, self._tokens + refill)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens * self._interval)
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for the next `seconds` (e.g. a 429's Retry-After)."""
+        with self._lock:
+            now = time.monotonic()
+            refill = (now - self._updated) / self._interval
+            self._tokens = min(self._capacity, self._tokens + refill)
+            self._updated = now
+            # Push the next token at least `seconds` out, and drop any saved-up burst
+            self._tokens = min(self._tokens, -seconds / self._interval)
+
+    def acquire(self) -> None:
+        """Block the calling thread until a token is available."""
+        delay = self._reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """Wait (without blocking the event loop) until a token is available."""
+        delay = self._reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class AIMDLimiter:
+    """Adaptive concurrency limit using additive-increase/multiplicative-decrease.
+
+    Every successful request raises the limit by `increase`, up to `maximum`. A
+    throttled request (429/5xx) multiplies it by `decrease`, down to `minimum`.
+    If `latency_target` is set, a full window of successes whose mean latency is
+    above the target also counts as throttling. Callers wait in acquire() while
+    the number of requests in flight is at the current limit. For asyncio tasks.
+    """
+
+    def __init__(
+        self,
+        maximum: int,
+        minimum: int = 1,
+        increase: float = 0.5,
+        decrease: float = 0.5,
+        latency_target: float | None = None,
+        window: int = 32,
+    ):
+        self._limit = float(maximum)  # Start optimistic; back off on throttling
+        self._maximum = maximum
+        self._minimum = minimum
+        self._increase = increase
+        self._decrease = decrease
+        self._latency_target = latency_target
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        return max(self._minimum, int(self._limit))
+
+    async def acquire(self) -> None:
+        """Wait until there is room under the current limit, then take a slot."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+
+    async def release(
+        self, throttled: bool | None, latency: float | None = None
+    ) -> None:
+        """Free a slot and adjust the limit from the request's outcome.
+
+        Pass throttled=None when there is no outcome (e.g. the request was
+        cancelled or never got a response): the slot is freed, the limit is kept.
+        """
+        async with self._condition:
+            self._in_flight -= 1
+            if throttled is None:
+                self._condition.notify_all()
+                return
+            if latency is not None and not throttled:
+                self._latencies.append(latency)
+                throttled = self._too_slow()
+            if throttled:
+                self._limit = max(self._minimum, self._limit * self._decrease)
+                self._latencies.clear()
+            else:
+                self._limit = min(self._maximum, self._limit + self._increase)
+            self._condition.notify_all()
+
+    def _too_slow(self) -> bool:
+        if (
+            self._latency_target is None
+            or len(self._latencies) < self._latencies.maxlen
+        ):
+            return False
+        return sum(self._latencies) / len(self._latencies) > self._latency_target
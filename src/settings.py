@@ -1,3 +1,6 @@
+from functools import lru_cache
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import RedisDsn  # Import RedisDsn for validation
 
@@ -8,17 +11,32 @@ class Settings(BaseSettings):
         env_file=".env",
         env_file_encoding="utf-8",
         extra="ignore",  # Ignore extra fields if any
+        frozen=True,  # Shared via get_settings(), so make it immutable
     )
 
     TWILIO_ACCOUNT_SID: str
     TWILIO_AUTH_TOKEN: str
     TWILIO_PHONE_NUMBER: str
+    # Optional Messaging Service; when set, sends use its sender pool instead
+    TWILIO_MESSAGING_SERVICE_SID: Optional[str] = None
 
     # Database settings
     DATABASE_URL: str  # Basic string validation is often enough for SQLAlchemy
+    DB_POOL_SIZE: int = 10  # Connections kept open per process by the engine
 
     # Redis settings (for arq task queue)
     REDIS_URL: RedisDsn  # Use Pydantic's RedisDsn for validation
+    REDIS_MAX_CONNECTIONS: int = 50  # Per-process cap on the arq Redis pool
+    ARQ_POLL_DELAY: float = 0.5  # Seconds between worker polls of the arq queue
+
+    # Sending settings
+    RECIPIENTS_CSV: str = "August Rent - Sheet1.csv"  # Tenant sheet to remind
+    MAX_CONCURRENCY: int = 8  # Max Twilio requests in flight at once
+    TWILIO_MPS: int = 10  # Messages per second allowed for the sending number/service
+    TWILIO_LATENCY_TARGET: float = 2.0  # Seconds; back off when sends average slower
 
 
-settings = Settings()  # type: ignore
+# Built (read .env + validate) once per process; reset with get_settings.cache_clear()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    return Settings()  # type: ignore
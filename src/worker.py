@@ -1,80 +1,179 @@
 # src/worker.py
+import asyncio
+import datetime
 import logging
-from typing import Dict, Any  # For typing ctx
+from typing import Dict, Any, Optional, Sequence  # For typing ctx
+from uuid import uuid4
 
 from arq import create_pool
-from arq.connections import RedisSettings
+from arq.connections import ArqRedis, RedisSettings
+from arq.constants import job_key_prefix, result_key_prefix
+from arq.jobs import serialize_job
+from arq.utils import timestamp_ms
 
-from src.settings import settings  # Absolute import
+from src.settings import get_settings  # Absolute import
 from src.logging_config import setup_logging  # Absolute import
+from src.main import create_twilio_client, read_tenants, send_message
+from src.rate_limit import AIMDLimiter, TokenBucket  # Absolute import
 # from src import crud, models # Absolute import (when needed)
 # from src.database import SessionLocal # Absolute import (when needed)
-# from src.main import send_message # Absolute import (when needed)
 
 # --- Setup Logging ---
 setup_logging()  # Call the setup function once on import
 
 logger = logging.getLogger(__name__)
 
-# --- Placeholder Task Functions ---
+# --- Task Functions ---
 
 
 # Add type hint for arq context dictionary
-async def send_single_reminder_task(ctx: Dict[str, Any], recipient_id: int):
-    """Sends a reminder to a single recipient (identified by DB ID)."""
-    logger.info(
-        f"Running task: send_single_reminder_task for recipient_id={recipient_id}"
-    )
-    # redis = ctx["redis"]
-    # db = SessionLocal() # Create a new session for this task
+async def send_single_reminder_task(ctx: Dict[str, Any], name: str, phone_number: str):
+    """Sends a reminder to a single recipient."""
+    # arq already logs every job start/finish at INFO; this is per-send detail
+    logger.debug("Running task: send_single_reminder_task for %s", name)
     try:
-        # 1. Get recipient details from DB using recipient_id
-        # recipient = crud.get_recipient(db, recipient_id)
-        # if not recipient or not recipient.send_flag:
-        #     logger.warning(f"Recipient {recipient_id} not found or flag disabled, skipping.")
-        #     return
-
-        # 2. Call the actual sending logic (e.g., Twilio)
-        # send_message(phone_number=recipient.phone_number, name=recipient.name)
-        logger.info(f"Placeholder: Sent reminder to recipient {recipient_id}")
+        # Paced by the shared limiters; the send itself is async (aiohttp)
+        await send_message(
+            ctx["twilio"],
+            phone_number=phone_number,
+            name=name,
+            limiter=ctx["limiter"],
+            concurrency=ctx["concurrency"],
+        )
         # Optionally update DB status for this recipient
 
-    except Exception as e:
-        logger.error(f"Error in send_single_reminder_task for {recipient_id}: {e}")
+    except Exception:
+        logger.exception("Error in send_single_reminder_task for %s", name)
         # Add retry logic or specific error handling if needed
-    finally:
-        # db.close() # Ensure session is closed
-        pass
 
 
 async def send_all_reminders_task(ctx: Dict[str, Any]):
     """Gets all applicable recipients and enqueues individual tasks."""
     logger.info("Running task: send_all_reminders_task")
-    # db = SessionLocal()
     try:
-        # 1. Query DB for all recipients where send_flag is True
-        # recipients_to_send = crud.get_active_recipients(db)
-        recipients_to_send = [1, 2, 3]  # Placeholder IDs
-        logger.info(f"Found {len(recipients_to_send)} recipients to send reminders to.")
-
-        # 2. Enqueue a separate job for each recipient
-        redis = ctx["redis"]  # Get redis pool from context
-        for recipient_id in recipients_to_send:
-            # Type checkers might not know about enqueue_job on the redis object
-            await redis.enqueue_job("send_single_reminder_task", recipient_id)  # type: ignore[attr-defined]
-            logger.debug(
-                f"Enqueued send_single_reminder_task for recipient_id={recipient_id}"
+        # 1. Read the tenants to remind from the recipients sheet into a list, so the
+        # file is closed before enqueueing. Once recipients live in the DB, do the
+        # same: materialize one query and release the connection before fanning out:
+        # with SessionLocal() as db:
+        #     recipients_to_send = [
+        #         (r.name, r.phone_number) for r in crud.get_active_recipients(db)
+        #     ]
+        recipients_to_send = await asyncio.to_thread(
+            read_tenants, get_settings().RECIPIENTS_CSV
+        )
+        logger.info(
+            "Found %d recipients to send reminders to.", len(recipients_to_send)
+        )
+
+        # 2. Enqueue a separate (name, phone_number) job per recipient, in bulk
+        redis: ArqRedis = ctx["redis"]  # Get redis pool from context
+        enqueued = await enqueue_jobs_bulk(
+            redis,
+            "send_single_reminder_task",
+            recipients_to_send,
+            [reminder_job_id(phone) for _, phone in recipients_to_send],
+        )
+        logger.info("Enqueued %d send_single_reminder_task jobs.", enqueued)
+
+    except Exception:
+        logger.exception("Error in send_all_reminders_task")
+
+
+# --- Bulk Enqueueing ---
+def reminder_job_id(phone_number: str, day: Optional[datetime.date] = None) -> str:
+    """Deterministic job ID, so a recipient is reminded at most once per day."""
+    day = day or datetime.date.today()
+    return f"rem:{phone_number}:{day.isoformat()}"
+
+
+async def enqueue_jobs_bulk(
+    redis: ArqRedis,
+    function: str,
+    args_list: Sequence[tuple[Any, ...]],
+    job_ids: Optional[Sequence[Optional[str]]] = None,
+    batch_size: int = 10_000,
+) -> int:
+    """Enqueue one `function` job per args tuple in one Redis round-trip per batch.
+
+    Writes the same job key + queue entry as ArqRedis.enqueue_job, which costs
+    several round-trips per job. Like enqueue_job, a job is skipped if its ID is
+    already queued or has a result. Returns the number of jobs enqueued.
+    """
+    if job_ids is None:
+        job_ids = [None] * len(args_list)
+    ids = [job_id or uuid4().hex for job_id in job_ids]
+
+    # Bound each pipeline's size so huge fan-outs don't buffer everything at once
+    enqueued = 0
+    for start in range(0, len(ids), batch_size):
+        end = start + batch_size
+        enqueued += await _enqueue_batch(
+            redis, function, args_list[start:end], ids[start:end]
+        )
+    return enqueued
+
+
+# Per job, atomically: skip if it already has a result (finished) or a job key
+# (queued/running), else write the job key and queue it. Running check, claim and
+# ZADD as one script means a job finishing mid-enqueue can't be queued again, and
+# a crash can't leave a claimed job key with no queue entry.
+# KEYS: job key, result key, queue. ARGV: payload, expiry ms, job id, score.
+_ENQUEUE_JOB_LUA = """
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    return 0
+end
+if not redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2], 'NX') then
+    return 0
+end
+redis.call('ZADD', KEYS[3], ARGV[4], ARGV[3])
+return 1
+"""
+
+
+async def _enqueue_batch(
+    redis: ArqRedis,
+    function: str,
+    args_list: Sequence[tuple[Any, ...]],
+    ids: Sequence[str],
+) -> int:
+    # One round-trip: pipeline one script call per job, scored by enqueue time as arq
+    enqueue_job = redis.register_script(_ENQUEUE_JOB_LUA)
+    enqueue_time_ms = timestamp_ms()
+    async with redis.pipeline(transaction=False) as pipe:
+        for job_id, args in zip(ids, args_list):
+            job = serialize_job(
+                function,
+                args,
+                {},
+                None,
+                enqueue_time_ms,
+                serializer=redis.job_serializer,
             )
-
-    except Exception as e:
-        logger.error(f"Error in send_all_reminders_task: {e}")
-    finally:
-        # db.close()
-        pass
+            await enqueue_job(
+                keys=[
+                    job_key_prefix + job_id,
+                    result_key_prefix + job_id,
+                    redis.default_queue_name,
+                ],
+                args=[job, redis.expires_extra_ms, job_id, enqueue_time_ms],
+                client=pipe,
+            )
+        queued = await pipe.execute()
+    return sum(queued)
 
 
 async def startup(ctx: Dict[str, Any]):
     logger.info("Worker starting up...")
+    # Shared by all send tasks in this process so they respect the MPS limit together
+    ctx["limiter"] = TokenBucket(get_settings().TWILIO_MPS)
+    # Backs off the number of sends in flight when Twilio throttles or slows down
+    ctx["concurrency"] = AIMDLimiter(
+        get_settings().MAX_CONCURRENCY,
+        latency_target=get_settings().TWILIO_LATENCY_TARGET,
+    )
+    # One Twilio client per worker process, shared by every send task; its 429
+    # retries pause the shared limiter for the Retry-After
+    ctx["twilio"] = create_twilio_client(ctx["limiter"])
     # Can initialize resources here if needed, e.g., DB connection pool
     # ctx['db_pool'] = await create_db_pool()
 
@@ -82,6 +181,7 @@ async def startup(ctx: Dict[str, Any]):
 async def shutdown(ctx: Dict[str, Any]):
     logger.info("Worker shutting down...")
     # Clean up resources
+    await ctx["twilio"].http_client.close()
     # await close_db_pool(ctx['db_pool'])
 
 
@@ -92,8 +192,20 @@ class WorkerSettings:
     on_startup = startup
     on_shutdown = shutdown
     # Pass the string representation of the DSN
-    redis_settings = RedisSettings.from_dsn(str(settings.REDIS_URL))
-    # max_jobs = 10 # Control concurrency
+    redis_settings = RedisSettings.from_dsn(str(get_settings().REDIS_URL))
+    # Bound the connections each process can open against Redis
+    redis_settings.max_connections = get_settings().REDIS_MAX_CONNECTIONS
+    # arq delivers jobs by polling its queue ZSET (it has no Streams mode), so the
+    # poll interval bounds dispatch latency against idle Redis load
+    poll_delay = get_settings().ARQ_POLL_DELAY
+    # Keep results for a day: the result key is what stops a re-run of
+    # send_all_reminders_task later the same day from re-sending (see reminder_job_id)
+    keep_result = 24 * 60 * 60
+    # Control concurrency: no more jobs than ~2s worth of Twilio sends, and never
+    # so many that they exhaust the DB pool (2 connections left for everything else)
+    max_jobs = min(
+        get_settings().TWILIO_MPS * 2, max(1, get_settings().DB_POOL_SIZE - 2)
+    )
     # job_timeout = 60 # Timeout for a single job
 
 
@@ -102,12 +214,16 @@ class WorkerSettings:
 # In FastAPI, you might create this on startup and store it in app.state
 
 _arq_redis_pool = None
+_arq_redis_pool_lock = asyncio.Lock()
 
 
 async def get_arq_pool():
     global _arq_redis_pool
     if _arq_redis_pool is None:
-        _arq_redis_pool = await create_pool(WorkerSettings.redis_settings)
+        # Double-checked: concurrent callers wait here instead of each creating a pool
+        async with _arq_redis_pool_lock:
+            if _arq_redis_pool is None:
+                _arq_redis_pool = await create_pool(WorkerSettings.redis_settings)
     return _arq_redis_pool
 
 